@@ -1,99 +1,270 @@
 #!/usr/bin/env python3
-import argparse, gzip, io, json, os, re, sys
-from typing import Any, Iterable
+import argparse, io, itertools, os, re, sys
+from multiprocessing import Pool
+from typing import Any, Iterable, Iterator
+
+try:
+    from isal import igzip as gzip_mod  # ISA-L inflate, drop-in for gzip.open
+except ImportError:
+    import gzip as gzip_mod
+
+try:
+    import orjson as _json  # faster than stdlib json and parses bytes without decoding
+except ImportError:
+    import json as _json
+
+try:
+    import hyperscan
+except ImportError:  # no DFA engine: scan_sha1 falls back to SHA1_RE_B
+    hyperscan = None
+
+try:
+    import ijson
+except ImportError:  # no streaming parser: fall back to load_events (whole file in RAM)
+    ijson = None
 
 SHA1_RE = re.compile(r"\b[0-9a-fA-F]{40}\b")
+SHA1_RE_B = re.compile(rb"\b[0-9a-fA-F]{40}\b")  # same pattern on raw bytes: no utf-8 decode for the text scan
+# the raw text keeps JSON escapes: in "\n<sha>" the "n" is a word char, so \b misses a hash
+# the decoded value has; a second pattern anchored on the backslash catches those
+SHA1_ESC_RE_B = re.compile(rb"\\[bfnrt]([0-9a-fA-F]{40})\b")
+_WORD_BYTES = frozenset(b"0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz_")  # \w for bytes patterns
+WRITE_CHUNK = 1_000_000  # hashes per output write; bounds the joined string to ~41 MB
+READ_BUFFER_SIZE = 128 * 1024  # same as CPython's gzip.READ_BUFFER_SIZE; default 8 KiB inflates in tiny batches
 
-def open_text_auto(path: str):
-    # transparently open .json or .json.gz as text (utf-8)
+def open_binary_auto(path: str):
+    # transparently open .json or .json.gz as bytes; ijson and json.loads both take utf-8 bytes
     if path.endswith(".gz"):
-        return io.TextIOWrapper(gzip.open(path, "rb"), encoding="utf-8")
-    return open(path, "r", encoding="utf-8")
-
-def iter_json_stream(obj: Any) -> Iterable[Any]:
-    """Yield every value in nested JSON (dict/list/scalars)."""
-    if isinstance(obj, dict):
-        for v in obj.values():
-            yield from iter_json_stream(v)
-    elif isinstance(obj, list):
-        for v in obj:
-            yield from iter_json_stream(v)
+        raw = gzip_mod.open(path, "rb")
+        return io.BufferedReader(raw, buffer_size=READ_BUFFER_SIZE)
+    return open(path, "rb")
+
+if hyperscan is not None:
+    _HS_DB = hyperscan.Database()
+    _HS_DB.compile(expressions=[SHA1_RE_B.pattern, SHA1_ESC_RE_B.pattern], ids=[1, 2], elements=2, flags=[0, 0])
+
+def scan_sha1(buf: bytes) -> Iterator[bytes]:
+    """Yield every 40-hex token in buf, also right after a letter escape (hyperscan DFA, else regex)."""
+    if hyperscan is not None:
+        ends = []
+        # fixed-width pattern: the match start is always `to - 40`
+        _HS_DB.scan(buf, match_event_handler=lambda _id, _from, to, _flags, _ctx: ends.append(to))
+        for j in ends:
+            yield buf[j - 40:j]
     else:
-        yield obj
+        for m in SHA1_RE_B.finditer(buf):
+            yield m.group(0)
+        for m in SHA1_ESC_RE_B.finditer(buf):
+            yield m.group(1)
+
+def _add_sha1s(buf: bytes, shas: set[str]):
+    shas.update(h.decode("ascii").lower() for h in scan_sha1(buf))
+
+class Sha1Tap:
+    """
+    Read-through wrapper that scans the raw JSON text for SHA-1s while the parser
+    pulls it in, so no tree walk is needed. A trailing word run is held back until
+    the next read so a hash split across two reads is still matched.
+    """
+    def __init__(self, f, shas: set[str]):
+        self._f = f
+        self._tail = b""
+        self.shas = shas
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._f.read(size)
+        if size != 0:
+            self._scan(data)
+        return data
 
-def load_events(path: str):
-    with open_text_auto(path) as f:
+    def finish(self):
+        # drain whatever the parser did not consume (trailing whitespace) and flush the tail
+        while self.read(READ_BUFFER_SIZE):
+            pass
+
+    def _scan(self, data: bytes):
+        buf = self._tail + data
+        cut = len(buf)
+        if data:  # not EOF: the last word run may continue in the next read
+            while cut and buf[cut - 1] in _WORD_BYTES:
+                cut -= 1
+            if cut and buf[cut - 1] == 0x5C:  # keep the backslash of an escape with its letter
+                cut -= 1
+        _add_sha1s(buf[:cut], self.shas)
+        self._tail = buf[cut:]
+
+def load_events(path: str, shas: set[str] | None = None):
+    with open_binary_auto(path) as f:
         txt = f.read().strip()
     # GitHub hour dumps are typically a JSON array; also handle JSONL just in case.
     try:
-        data = json.loads(txt)
-        if isinstance(data, list):
-            return [x for x in data if isinstance(x, dict)]
-        elif isinstance(data, dict):
-            evs = data.get("events")
-            return [x for x in evs if isinstance(x, dict)] if isinstance(evs, list) else [data]
-        else:
-            return []
-    except json.JSONDecodeError:
-        # fallback: JSON Lines (one JSON object per line)
+        data = _json.loads(txt)
+    except ValueError:  # json/orjson JSONDecodeError both subclass ValueError
+        # fallback: JSON Lines (one JSON object per line); only lines that parse are scanned
         events = []
         for line in txt.splitlines():
             line = line.strip()
             if not line:
                 continue
             try:
-                obj = json.loads(line)
-                if isinstance(obj, dict):
-                    events.append(obj)
-            except json.JSONDecodeError:
-                pass
+                obj = _json.loads(line)
+            except ValueError:
+                continue
+            if shas is not None:
+                _add_sha1s(line, shas)
+            if isinstance(obj, dict):
+                events.append(obj)
         return events
+    if shas is not None:
+        # one pass over the raw text; see iter_events for how it differs from a value walk
+        _add_sha1s(txt, shas)
+    if isinstance(data, list):
+        return [x for x in data if isinstance(x, dict)]
+    elif isinstance(data, dict):
+        evs = data.get("events")
+        return [x for x in evs if isinstance(x, dict)] if isinstance(evs, list) else [data]
+    else:
+        return []
+
+def _unwrap_events(obj: Any) -> Iterator[dict]:
+    # a top-level object is either {"events": [...]} or a single event
+    evs = obj.get("events") if isinstance(obj, dict) else None
+    if isinstance(evs, list):
+        yield from (x for x in evs if isinstance(x, dict))
+    elif isinstance(obj, dict):
+        yield obj
+
+def iter_events(path: str, shas: set[str] | None = None) -> Iterator[dict]:
+    """
+    Yield events one at a time so extraction overlaps parsing and memory stays
+    O(one event) instead of O(file). Needs ijson; otherwise defers to load_events.
+    If shas is given, every 40-hex token in the raw text is added to it as well.
+    That is not quite a walk over the decoded string values: 40-hex object keys and
+    40-digit numbers match too, and the only escapes understood in front of a hash
+    are the letter ones (\\n, \\t, ...). Malformed JSONL lines are skipped, not scanned.
+    """
+    if ijson is None:
+        yield from load_events(path, shas)
+        return
+    # sniff the first non-blank line: '[' = JSON array; '{' that parses on its own = JSONL;
+    # any other '{' = one object spanning several lines
+    first_line = b""
+    with open_binary_auto(path) as f:
+        for line in f:
+            if line.strip():
+                first_line = line.strip()
+                break
+    first = first_line[:1]
+    jsonl = False
+    if first == b"{":
+        try:
+            jsonl = isinstance(_json.loads(first_line), dict)
+        except ValueError:
+            pass
+    try:
+        with open_binary_auto(path) as f:
+            if jsonl:
+                # like load_events: skip malformed lines instead of aborting, and scan each
+                # line on its own once it parsed
+                for line in f:
+                    try:
+                        obj = _json.loads(line)
+                    except ValueError:
+                        continue
+                    if shas is not None:
+                        _add_sha1s(line, shas)
+                    yield from _unwrap_events(obj)
+                return
+            # the tap's hashes count only once the whole document parsed
+            found: set[str] = set()
+            src = Sha1Tap(f, found) if shas is not None else f
+            if first == b"[":
+                for x in ijson.items(src, "item"):
+                    if isinstance(x, dict):
+                        yield x
+            elif first == b"{":
+                for obj in ijson.items(src, "", multiple_values=True):
+                    yield from _unwrap_events(obj)
+            if shas is not None:
+                src.finish()
+                shas |= found
+    except ijson.JSONError:
+        # malformed document: redo it the way load_events always did (whole parse, then
+        # JSONL line by line). Events yielded before the error repeat; results are sets.
+        yield from load_events(path, shas)
 
-def extract_all_sha1(events) -> list[str]:
+def _chunks(events: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    it = iter(events)
+    while chunk := list(itertools.islice(it, size)):
+        yield chunk
+
+def _scan_chunk(events: Iterable[dict]) -> set[str]:
     shas: set[str] = set()
+    # hot loop: bind the pattern method, set.add and builtins as locals (LOAD_FAST).
+    # JSON parsers build exact dict/list/str, so `type(x) is` replaces isinstance.
+    _fullmatch = SHA1_RE.fullmatch
+    _add = shas.add
+    _dict, _list, _str = dict, list, str
 
     # Fast paths per GitHub event docs: payload.commits[*].sha, PR head/base, comment.commit_id, etc.
     for ev in events:
-        pld = ev.get("payload", {}) if isinstance(ev, dict) else {}
+        pld = ev.get("payload", {}) if type(ev) is _dict else {}
 
         # PushEvent commits[*].sha
         commits = pld.get("commits")
-        if isinstance(commits, list):
+        if type(commits) is _list:
             for c in commits:
-                s = isinstance(c, dict) and c.get("sha")
-                if isinstance(s, str) and SHA1_RE.fullmatch(s):
-                    shas.add(s.lower())
+                s = type(c) is _dict and c.get("sha")
+                if type(s) is _str and _fullmatch(s):
+                    _add(s.lower())
 
         # PR head/base sha (PullRequestEvent & others)
         pr = pld.get("pull_request")
-        if isinstance(pr, dict):
+        if type(pr) is _dict:
             for side in ("head", "base"):
                 o = pr.get(side)
-                if isinstance(o, dict):
+                if type(o) is _dict:
                     s = o.get("sha")
-                    if isinstance(s, str) and SHA1_RE.fullmatch(s):
-                        shas.add(s.lower())
+                    if type(s) is _str and _fullmatch(s):
+                        _add(s.lower())
 
         # CommitCommentEvent: payload.comment.commit_id
         cmt = pld.get("comment")
-        if isinstance(cmt, dict):
+        if type(cmt) is _dict:
             cid = cmt.get("commit_id")
-            if isinstance(cid, str) and SHA1_RE.fullmatch(cid):
-                shas.add(cid.lower())
+            if type(cid) is _str and _fullmatch(cid):
+                _add(cid.lower())
 
         # Common fields: before/after/head_sha in various events
         for key in ("before", "after", "head_sha"):
             v = pld.get(key)
-            if isinstance(v, str) and SHA1_RE.fullmatch(v):
-                shas.add(v.lower())
+            if type(v) is _str and _fullmatch(v):
+                _add(v.lower())
 
-        # Fallback: scan ALL string fields for 40-hex SHAs
-        for v in iter_json_stream(ev):
-            if isinstance(v, str):
-                for m in SHA1_RE.findall(v):
-                    shas.add(m.lower())
+    return shas
 
-    return sorted(shas)
+def extract_all_sha1(events: Iterable[dict], jobs: int | None = 1, chunk_size: int = 4096,
+                     shas: set[str] | None = None) -> list[str]:
+    # Events are independent: scan chunks of them in worker processes and union the partial sets.
+    # jobs=1 (default) scans inline; jobs=None uses every core. Serial is the right default:
+    # the payload fast paths are cheap, so pickling every event to workers costs more than it saves.
+    # shas: the set iter_events fills with its raw-text scan. That scan already has every hash
+    # the payload fast paths can find, so the events are only drained (the scan runs as they are read).
+    if shas is not None:
+        for _ in events:
+            pass
+        found = set(shas)
+    elif jobs == 1:
+        found = _scan_chunk(events)
+    else:
+        with Pool(jobs) as p:
+            partials = p.imap_unordered(_scan_chunk, _chunks(events, chunk_size))
+            found = set().union(*partials)
+    # Keep the lexicographic order: R1 (include/core/r1.hpp) takes the first 250k lines,
+    # so insertion order would make the dataset depend on parse/worker scheduling.
+    out = list(found)
+    out.sort()
+    return out
 
 def main():
     ap = argparse.ArgumentParser(description="Extract all 160-bit SHA-1 commit hashes (40 hex) from GitHub events JSON/JSONL (.json or .json.gz).")
@@ -101,15 +272,19 @@ def main():
     ap.add_argument("--out", default="sha1_all.txt", help="Output file (one SHA-1 per line)")
     args = ap.parse_args()
 
-    events = load_events(args.input)
-    if not events:
+    text_shas: set[str] = set()
+    events = iter_events(args.input, text_shas)
+    first = next(events, None)
+    if first is None:
         print("No events found or unrecognized format.", file=sys.stderr)
         sys.exit(2)
 
-    shas = extract_all_sha1(events)
+    shas = extract_all_sha1(itertools.chain((first,), events), shas=text_shas)
     with open(args.out, "w", encoding="utf-8") as f:
-        for s in shas:
-            f.write(s + "\n")
+        # one join+write per WRITE_CHUNK hashes instead of a write per line
+        for i in range(0, len(shas), WRITE_CHUNK):
+            f.write("\n".join(shas[i:i + WRITE_CHUNK]))
+            f.write("\n")
 
     print(f"Found {len(shas)} unique SHA-1 hashes.")
     print(f"Wrote: {args.out}")
@@ -1,46 +1,47 @@
 #!/usr/bin/env python3
-import argparse, zipfile, io, os
+import argparse, zipfile, os
 
-def stream_words_from_zip(zip_path: str):
+def stream_words_from_zip(zip_path: str, limit: int | None = None):
     """
-    Yield whitespace-separated tokens from the first (largest) text file inside the zip,
-    streaming without loading everything into memory.
+    Yield whitespace-separated tokens (as bytes) from the first (largest) text file inside the zip,
+    streaming without loading everything into memory. Stops reading after `limit` tokens.
     """
+    if limit is not None and limit <= 0:
+        return
+    emitted = 0
     with zipfile.ZipFile(zip_path, 'r') as z:
         # Pick the largest file in the archive (text8 zips usually have a single file).
         info = max(z.infolist(), key=lambda i: i.file_size)
-        with z.open(info, 'r') as raw:
-            # Decode as ASCII/UTF-8; text8 is plain ASCII.
-            f = io.TextIOWrapper(raw, encoding='utf-8', errors='strict', newline='')
-            buf = ''
+        with z.open(info, 'r') as f:
+            # text8 is plain ASCII: split the raw bytes, no decoding needed.
+            tail = b''
             CHUNK = 1 << 20  # 1 MiB chunks
             while True:
                 chunk = f.read(CHUNK)
                 if not chunk:
-                    if buf:
+                    if tail:
                         # last residue
-                        for w in buf.split():
-                            yield w
-                    break
-                buf += chunk
-                # Split by whitespace; keep the tail (possibly incomplete token) in buf
-                parts = buf.split()
-                if not parts:
-                    # all whitespace; keep empty residue
-                    buf = ''
-                    continue
-                # If last char in chunk may split a word, preserve tail
-                if buf[-1].isspace():
-                    # clean split
+                        yield tail
+                    return
+                # Only the short trailing token from the previous chunk is prepended
+                chunk = tail + chunk
+                parts = chunk.split()
+                if chunk[-1:].isspace() or not parts:
+                    # clean split (or all whitespace): nothing carries over
+                    tail = b''
                     for w in parts:
                         yield w
-                    buf = ''
+                        emitted += 1
+                        if limit is not None and emitted >= limit:
+                            return
                 else:
-                    # keep the last segment in buf (may be incomplete)
-                    *full, tail = parts
-                    for w in full:
+                    # the last segment may continue in the next chunk
+                    tail = parts[-1]
+                    for w in parts[:-1]:
                         yield w
-                    buf = tail
+                        emitted += 1
+                        if limit is not None and emitted >= limit:
+                            return
 
 def write_first_n(zip_path: str, N: int, out_prefix: str):
     os.makedirs(os.path.dirname(out_prefix) or ".", exist_ok=True)
@@ -48,12 +49,11 @@ def write_first_n(zip_path: str, N: int, out_prefix: str):
     out_lines = f"{out_prefix}_words_per_line.txt"
 
     count = 0
-    with open(out_space, "w", encoding="utf-8") as f_space, \
-         open(out_lines, "w", encoding="utf-8") as f_lines:
+    with open(out_space, "wb") as f_space, \
+         open(out_lines, "wb") as f_lines:
         first = True
-        for w in stream_words_from_zip(zip_path):
-            if count >= N:
-                break
+        # the generator stops decompressing once N tokens are out
+        for w in stream_words_from_zip(zip_path, limit=N):
             # basic hygiene: drop empty tokens (shouldn't occur) and strip
             if not w:
                 continue
@@ -61,10 +61,10 @@ def write_first_n(zip_path: str, N: int, out_prefix: str):
                 f_space.write(w)
                 first = False
             else:
-                f_space.write(" ")
+                f_space.write(b" ")
                 f_space.write(w)
             f_lines.write(w)
-            f_lines.write("\n")
+            f_lines.write(b"\n")
             count += 1
 
     print(f"Extracted {count} words.")
@@ -1,50 +1,35 @@
 ﻿# plot_all.py
 # Iterate over all CSV files in a directory and generate strip plots
 import numpy as np
+import matplotlib
+matplotlib.use("Agg")  # no GUI backend: figures are only saved, also in worker processes
 import matplotlib.pyplot as plt
-from scipy.stats import moment
-import csv
+plt.rcParams.update({
+    'agg.path.chunksize': 10000,     # draw huge paths in chunks instead of one Agg call
+    'font.family': 'DejaVu Sans',    # bundled with matplotlib: no font fallback search
+    'figure.max_open_warning': 0,
+    'path.simplify_threshold': 1.0,
+})
 import sys
-from collections import defaultdict
 import os
 import glob
+from multiprocessing import Pool
+from relerr_utils import load_relerr, sixth_moment
 
-# Directory to search
-indir = "."
-if len(sys.argv) > 1:
-    indir = sys.argv[1]
-
-csv_files = glob.glob(os.path.join(indir, "*.csv"))
-if not csv_files:
-    print("No CSV files found in", indir)
-    sys.exit(0)
-
-for infile in csv_files:
-    rel_by_func = defaultdict(list)
-    with open(infile, newline='') as f:
-        rd = csv.DictReader(f)
-        for row in rd:
-            rel_by_func[row['function']].append(float(row['relerr']))
-
-    funcs = sorted(rel_by_func.keys())
+def _plot_one(infile):
+    funcs, rel_by_func = load_relerr(infile)
     if not funcs:
         print("Skipping", infile, "(no data)")
-        continue
+        return
 
     # 6th moment normalized
-    m6 = {}
-    for fn in funcs:
-        arr = np.array(rel_by_func[fn], dtype=float)
-        mu = arr.mean()
-        sd = arr.std(ddof=0)
-        z = (arr - mu) / (sd if sd > 0 else 1.0)
-        m6[fn] = moment(z, moment=6)
+    m6 = sixth_moment(rel_by_func)
 
     plt.figure(figsize=(7.2, 0.9 + 0.45 * len(funcs)))
     for i, fn in enumerate(funcs):
-        arr = np.array(rel_by_func[fn], dtype=float)
-        y = np.full_like(arr, fill_value=i, dtype=float)
-        plt.scatter(arr, y, s=5, alpha=0.25)
+        arr = rel_by_func[fn]
+        y = np.full_like(arr, fill_value=i)
+        plt.scatter(arr, y, s=5, alpha=0.25, rasterized=True)
 
     plt.xlabel('Relative error')
     yticks = list(range(len(funcs)))
@@ -58,3 +43,27 @@ for infile in csv_files:
     plt.savefig(outpng, dpi=150, bbox_inches='tight')
     plt.close()
     print(f"Saved {outpng} from {infile}")
+
+def main():
+    # Directory to search
+    indir = "."
+    if len(sys.argv) > 1:
+        indir = sys.argv[1]
+
+    csv_files = glob.glob(os.path.join(indir, "*.csv"))
+    if not csv_files:
+        print("No CSV files found in", indir)
+        sys.exit(0)
+
+    # each CSV is an independent figure: render them concurrently, with no more workers than
+    # files (on Windows every spawned worker re-imports matplotlib and pyarrow)
+    jobs = min(len(csv_files), os.cpu_count() or 1)
+    if jobs <= 1:
+        for infile in csv_files:
+            _plot_one(infile)
+    else:
+        with Pool(jobs) as p:
+            p.map(_plot_one, csv_files)
+
+if __name__ == "__main__":
+    main()
@@ -2,47 +2,39 @@
 # Produces a single figure with one strip per function.
 # --- Auto-zoom: include ALL points from non-MultShift functions ---
 import numpy as np
+import matplotlib
+matplotlib.use("Agg")  # headless: no GUI toolkit init, figures are only saved
 import matplotlib.pyplot as plt
-from scipy.stats import moment
-import csv
+plt.rcParams.update({
+    'agg.path.chunksize': 10000,     # draw huge paths in chunks instead of one Agg call
+    'font.family': 'DejaVu Sans',    # bundled with matplotlib: no font fallback search
+    'figure.max_open_warning': 0,
+    'path.simplify_threshold': 1.0,
+})
 import sys
-from collections import defaultdict
+from relerr_utils import load_relerr, sixth_moment
 
 infile = 'cms_a1_relerr.csv'
 if len(sys.argv) > 1:
     infile = sys.argv[1]
 
-# Load CSV
-rel_by_func = defaultdict(list)
-with open(infile, newline='') as f:
-    rd = csv.DictReader(f)
-    for row in rd:
-        rel_by_func[row['function']].append(float(row['relerr']))
-
-funcs = sorted(rel_by_func.keys())
-
-# 6th standardized moment per function
-m6 = {}
-for fn in funcs:
-    arr = np.array(rel_by_func[fn], dtype=float)
-    mu = arr.mean()
-    sd = arr.std(ddof=0)
-    z = (arr - mu) / (sd if sd > 0 else 1.0)
-    m6[fn] = moment(z, moment=6)
+# Load CSV, one float32 slice per function
+funcs, rel_by_func = load_relerr(infile)
+m6 = sixth_moment(rel_by_func)
 
 plt.figure(figsize=(7.2, 0.9 + 0.45*len(funcs)))
 
 # Strip points
 for i, fn in enumerate(funcs):
-    arr = np.array(rel_by_func[fn], dtype=float)
-    y = np.full_like(arr, fill_value=i, dtype=float)
-    plt.scatter(arr, y, s=5, alpha=0.25)
+    arr = rel_by_func[fn]
+    y = np.full_like(arr, fill_value=i)
+    plt.scatter(arr, y, s=5, alpha=0.25, rasterized=True)
 
 # --- Auto-zoom: include ALL points from non-MultShift functions ---
 EXCLUDE_FOR_LIMITS = {'MultShift'}
 included = [fn for fn in funcs if fn not in EXCLUDE_FOR_LIMITS] or funcs
 
-vals = np.concatenate([np.asarray(rel_by_func[fn], dtype=float) for fn in included])
+vals = np.concatenate([rel_by_func[fn] for fn in included])
 lo = float(np.min(vals))
 hi = float(np.max(vals))
 pad = 0.02 * max(1e-12, hi - lo)   # small visual padding
@@ -3,7 +3,14 @@
 # Output: <csv_basename>_time_per_hash.png
 
 import csv, sys, os
+import matplotlib
+matplotlib.use("Agg")  # headless: no GUI toolkit init, figures are only saved
 import matplotlib.pyplot as plt
+plt.rcParams.update({
+    'font.family': 'DejaVu Sans',    # bundled with matplotlib: no font fallback search
+    'figure.max_open_warning': 0,
+    'path.simplify_threshold': 1.0,
+})
 
 def main():
     if len(sys.argv) < 2:
@@ -1,6 +1,7 @@
 # Creates <outdir>/<csv_basename>_time_per_hash.png (no title).
 # Usage: python plot_time_per_hash_no_title.py --outdir <DIR> <csv1> [<csv2> ...]
 import sys, os, csv
+from multiprocessing import Pool
 
 def parse_args(argv):
     outdir = None
@@ -16,7 +17,14 @@ def parse_args(argv):
 
 def plot_file(infile: str, outdir: str | None):
     try:
+        import matplotlib
+        matplotlib.use("Agg")  # no GUI backend: figures are only saved, also in worker processes
         import matplotlib.pyplot as plt
+        plt.rcParams.update({
+            'font.family': 'DejaVu Sans',    # bundled with matplotlib: no font fallback search
+            'figure.max_open_warning': 0,
+            'path.simplify_threshold': 1.0,
+        })
     except Exception as e:
         print(f"[error] matplotlib not available: {e}")
         return
@@ -58,8 +66,15 @@ def main():
         print("Usage: python plot_time_per_hash_no_title.py --outdir <DIR> <csv1> [<csv2> ...]")
         sys.exit(1)
     outdir, files = parse_args(sys.argv[1:])
-    for p in files:
-        plot_file(p, outdir)
+    # each CSV is an independent figure: render them concurrently, with no more workers than
+    # files (on Windows every spawned worker re-imports matplotlib)
+    jobs = min(len(files), os.cpu_count() or 1)
+    if jobs <= 1:
+        for p in files:
+            plot_file(p, outdir)
+    else:
+        with Pool(jobs) as pool:
+            pool.starmap(plot_file, [(p, outdir) for p in files])
 
 if __name__ == "__main__":
     main()
@@ -1,10 +1,17 @@
 ﻿# plot_cms_strip_zoom_manual.py
 # Strip plot from CSV (function,rep,relerr) with adjustable zoom.
 import numpy as np
+import matplotlib
+matplotlib.use("Agg")  # headless: no GUI toolkit init, figures are only saved
 import matplotlib.pyplot as plt
-from scipy.stats import moment
-import csv, sys, argparse
-from collections import defaultdict
+plt.rcParams.update({
+    'agg.path.chunksize': 10000,     # draw huge paths in chunks instead of one Agg call
+    'font.family': 'DejaVu Sans',    # bundled with matplotlib: no font fallback search
+    'figure.max_open_warning': 0,
+    'path.simplify_threshold': 1.0,
+})
+import sys, argparse
+from relerr_utils import load_relerr, sixth_moment
 
 # ---- knobs (edit these or use CLI flags) ----
 XMIN = 2.3     # e.g., -0.05  (set both XMIN/XMAX to use absolute limits)
@@ -26,37 +33,26 @@ elif args.pct:
     PCT_LO, PCT_HI = float(args.pct[0]), float(args.pct[1])
 
 # ---- load ----
-rel = defaultdict(list)
-with open(infile, newline='') as f:
-    rd = csv.DictReader(f)
-    for row in rd:
-        rel[row['function']].append(float(row['relerr']))
-
-funcs = sorted(rel.keys())
+funcs, rel = load_relerr(infile)
 
 # ---- 6th standardized moment ----
-m6 = {}
-for fn in funcs:
-    arr = np.array(rel[fn], dtype=float)
-    mu, sd = arr.mean(), arr.std(ddof=0)
-    z = (arr - mu) / (sd if sd > 0 else 1.0)
-    m6[fn] = moment(z, moment=6)
+m6 = sixth_moment(rel)
 
 # ---- plot ----
 plt.figure(figsize=(7.5, 0.9 + 0.45 * len(funcs)))
 for i, fn in enumerate(funcs):
-    arr = np.array(rel[fn], dtype=float)
-    plt.scatter(arr, np.full_like(arr, i, dtype=float), s=6, alpha=0.28, label=fn)
+    arr = rel[fn]
+    plt.scatter(arr, np.full_like(arr, i), s=6, alpha=0.28, label=fn, rasterized=True)
 
 plt.axvline(0.0, linewidth=1)
 for v in [0.02, -0.02, 0.01, -0.01]:
     plt.axvline(v, linewidth=0.5, linestyle='--')
 
 # ---- compute x-limits ----
-all_vals = np.concatenate([np.asarray(rel[fn], dtype=float) for fn in funcs])
 if XMIN is not None and XMAX is not None:
     lo, hi = float(XMIN), float(XMAX)
 else:
+    all_vals = np.concatenate([rel[fn] for fn in funcs])
     lo, hi = np.percentile(all_vals, [PCT_LO, PCT_HI])
 pad = 0.05 * max(1e-12, (hi - lo))
 plt.xlim(lo - pad, hi + pad)
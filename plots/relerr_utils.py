@@ -0,0 +1,45 @@
+# relerr_utils.py
+# CSV ingest and per-function stats shared by the relerr strip plots (function,rep,relerr).
+import numpy as np
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pac
+except ImportError:  # fall back to pandas for CSV ingest
+    pac = None
+    import pandas as pd
+
+def load_relerr(infile):
+    # returns (sorted function names, {function: float32 relerr values})
+    if pac is not None:
+        tbl = pac.read_csv(infile, convert_options=pac.ConvertOptions(
+            include_columns=['function', 'relerr'], column_types={'relerr': pa.float32()}))
+        names = tbl.column('function').to_numpy()
+        relerr = tbl.column('relerr').to_numpy()
+    else:
+        df = pd.read_csv(infile, usecols=['function', 'relerr'], dtype={'relerr': np.float32})
+        names = df['function'].to_numpy()
+        relerr = df['relerr'].to_numpy()
+
+    # Group rows by function: one stable sort, then each function is a contiguous slice
+    funcs, codes = np.unique(names, return_inverse=True)
+    funcs = funcs.tolist()
+    relerr = relerr[np.argsort(codes, kind='stable')]
+    counts = np.bincount(codes, minlength=len(funcs))
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    return funcs, {fn: relerr[s:s + c] for fn, s, c in zip(funcs, starts, counts)}
+
+def sixth_moment(rel_by_func):
+    # 6th standardized moment per function, one pass over each slice.
+    # one float32 scratch buffer reused in place for every function (sums accumulate in float64):
+    # d -> d**2 -> variance, then (d**2 / var)**3 = z**6
+    buf = np.empty(max(map(len, rel_by_func.values()), default=0), dtype=np.float32)
+    m6 = {}
+    for fn, arr in rel_by_func.items():
+        d = buf[:len(arr)]
+        np.subtract(arr, arr.mean(dtype=np.float64), out=d)
+        np.square(d, out=d)
+        var = d.mean(dtype=np.float64)
+        np.divide(d, var if var > 0 else 1.0, out=d)
+        np.power(d, 3, out=d)
+        m6[fn] = d.mean(dtype=np.float64)
+    return m6
@@ -0,0 +1,50 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import extract_commit_sha1 as ecs
+
+SHA_A = "a" * 40
+SHA_B = "0123456789abcdef0123456789abcdef01234567"
+
+
+def _extract(text: str) -> list[str]:
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "events.json")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        shas: set[str] = set()
+        return ecs.extract_all_sha1(ecs.iter_events(path, shas), shas=shas)
+
+
+class MalformedJsonlTest(unittest.TestCase):
+    # an unbalanced quote on one line must not hide the hashes on the lines after it
+
+    def _check(self, text: str, expected: list[str]):
+        self.assertEqual(_extract(text), expected)
+        with mock.patch.object(ecs, "ijson", None):
+            self.assertEqual(_extract(text), expected)
+
+    def test_unterminated_string(self):
+        self._check('{"a": "x}\n{"sha": "%s"}\n' % SHA_A, [SHA_A])
+
+    def test_escaped_closing_quote(self):
+        self._check('{"a": "x\\"}\n{"sha": "%s"}\n{"sha": "%s"}\n' % (SHA_A, SHA_B), [SHA_B, SHA_A])
+
+    def test_bad_line_is_not_scanned(self):
+        self._check('{"sha": "%s"}\n{"sha": "%s"\n' % (SHA_A, SHA_B), [SHA_A])
+
+
+class EventsWrapperTest(unittest.TestCase):
+
+    def test_one_line_wrapper_is_unwrapped(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "events.json")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write('{"events": [{"id": "1"}, {"id": "2"}]}\n')
+            self.assertEqual([ev["id"] for ev in ecs.iter_events(path)], ["1", "2"])
+
+
+if __name__ == "__main__":
+    unittest.main()